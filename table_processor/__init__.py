@@ -1,14 +1,15 @@
 # __init__.py
 from .base_table import Table
-from .csv_handler import load_table as load_csv, save_table as save_csv
+from .csv_handler import load_table as load_csv, save_table as save_csv, iter_table as iter_csv
 from .pickle_handler import load_table as load_pickle, save_table as save_pickle
 from .text_handler import save_table as save_text
-from .table_operations import merge_tables
+from .table_operations import merge_tables, semi_join, anti_join, top_k_stream, sample_stream
 
 __all__ = [
     'Table',
-    'load_csv', 'save_csv',
+    'load_csv', 'save_csv', 'iter_csv',
     'load_pickle', 'save_pickle', 
     'save_text',
-    'merge_tables'
+    'merge_tables', 'semi_join', 'anti_join',
+    'top_k_stream', 'sample_stream'
 ]
\ No newline at end of file
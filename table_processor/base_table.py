@@ -1,7 +1,31 @@
 # base_table.py
-from typing import List, Dict, Any, Union, Optional
+import operator
+import pickle
+import sys
+from array import array
+from itertools import compress
+from typing import List, Dict, Any, Iterable, Union, Optional
+from .column_stats import ColumnStats, build_column_stats
+from .sampling import reservoir_sample, top_k_rows
 from .exceptions import *
 
+# Целочисленные коды array от узкого к широкому: берется первый, в который
+# помещается диапазон значений столбца
+_INT_TYPECODES = tuple((code, -(1 << (8 * array(code).itemsize - 1)),
+                        (1 << (8 * array(code).itemsize - 1)) - 1) for code in 'bhiq')
+
+# Ключ строки, в которой нет нужного столбца: не равен ничему
+_MISSING = object()
+
+_COMPARISONS = {
+    'eq': operator.eq,
+    'ne': operator.ne,
+    'gr': operator.gt,
+    'ls': operator.lt,
+    'ge': operator.ge,
+    'le': operator.le,
+}
+
 class Table:
     def __init__(self, data: Optional[List[List[Any]]] = None, 
                  headers: Optional[List[str]] = None,
@@ -10,6 +34,11 @@ class Table:
         self._headers = headers or []
         self._index_col = index_col
         self._column_types: Dict[Union[int, str], type] = {}
+        # Статистика столбцов; считается только при загрузке из файла, когда
+        # строки таблицы не видны снаружи (см. _build_stats)
+        self._stats: Dict[int, ColumnStats] = {}
+        # Версия данных; общая для таблиц, разделяющих одни и те же строки
+        self._data_version = [0]
         self._detect_column_types()
     
     def _detect_column_types(self) -> None:
@@ -75,7 +104,7 @@ class Table:
             new_table._column_types = new_types
             return new_table
         else:
-            return Table(selected_data, self._headers, self._index_col)
+            return self._share_rows(selected_data)
     
     def get_rows_by_index(self, *indices: Any, copy_table: bool = False) -> 'Table':
         if not self._data:
@@ -84,23 +113,19 @@ class Table:
         if not self._index_col:
             raise RowError("Индексный столбец не задан")
             
-        index_col_idx = self._get_column_index(self._index_col)
-        selected_data = []
-        
-        for row in self._data:
-            if index_col_idx < len(row) and row[index_col_idx] in indices:
-                selected_data.append(row)
-                
-        if copy_table:
-            import copy
-            new_data = copy.deepcopy(selected_data)
-            new_headers = copy.deepcopy(self._headers)
-            new_types = copy.deepcopy(self._column_types)
-            new_table = Table(new_data, new_headers, self._index_col)
-            new_table._column_types = new_types
-            return new_table
-        else:
-            return Table(selected_data, self._headers, self._index_col)
+        try:
+            bool_list = self.is_in(indices, self._index_col)
+        except OperationError:
+            # Нехешируемые значения индекса: линейный просмотр, как раньше
+            index_col_idx = self._get_column_index(self._index_col)
+            bool_list = [index_col_idx < len(row) and row[index_col_idx] in indices
+                         for row in self._data]
+        return self.filter_rows(bool_list, copy_table)
+    
+    def _share_rows(self, rows: List[List[Any]]) -> 'Table':
+        new_table = Table(rows, self._headers, self._index_col)
+        new_table._data_version = self._data_version
+        return new_table
     
     def _get_column_index(self, column: Union[int, str]) -> int:
         if isinstance(column, int):
@@ -149,6 +174,7 @@ class Table:
                     row[col_idx] = self._convert_value(row[col_idx], col_header)
                 except OperationError:
                     pass
+        self._data_changed()
     
     def get_values(self, column: Union[int, str] = 0) -> List[Any]:
         col_idx = self._get_column_index(column)
@@ -172,6 +198,7 @@ class Table:
         for i, value in enumerate(values):
             if i < len(self._data) and col_idx < len(self._data[i]):
                 self._data[i][col_idx] = self._convert_value(value, column)
+        self._data_changed([col_idx])
     
     def set_value(self, value: Any, column: Union[int, str] = 0) -> None:
         if len(self._data) != 1:
@@ -227,33 +254,24 @@ class Table:
     # ОПЕРАЦИИ СРАВНЕНИЯ
     def _comparison_operation(self, other: Any, operation: str, column: Union[int, str] = 0) -> List[bool]:
         col_idx = self._get_column_index(column)
-        result = []
+        if operation not in _COMPARISONS:
+            raise OperationError(f"Неизвестная операция сравнения: {operation}")
+        compare = _COMPARISONS[operation]
         
-        for row in self._data:
-            if col_idx >= len(row):
-                result.append(False)
-                continue
-                
-            try:
-                left_val = row[col_idx]
-                
-                if operation == 'eq':
-                    result.append(left_val == other)
-                elif operation == 'ne':
-                    result.append(left_val != other)
-                elif operation == 'gr':
-                    result.append(left_val > other)
-                elif operation == 'ls':
-                    result.append(left_val < other)
-                elif operation == 'ge':
-                    result.append(left_val >= other)
-                elif operation == 'le':
-                    result.append(left_val <= other)
-                else:
-                    raise OperationError(f"Неизвестная операция сравнения: {operation}")
-            except (TypeError, ValueError) as e:
-                raise OperationError(f"Ошибка при сравнении: {e}")
+        # Статистику не считаем здесь: используем только уже готовую и актуальную
+        stats = self._fresh_stats(col_idx)
+        if stats is None:
+            return _compare_rows(self._data, col_idx, compare, other)
         
+        # Блоки, целиком решаемые по статистике, не просматриваем
+        result = []
+        for chunk in stats.chunks:
+            decision = chunk.decide(operation, other)
+            if decision is not None:
+                result.extend([decision] * (chunk.stop - chunk.start))
+            else:
+                result.extend(_compare_rows(self._data[chunk.start:chunk.stop],
+                                            col_idx, compare, other))
         return result
     
     def eq(self, other: Any, column: Union[int, str] = 0) -> List[bool]:
@@ -278,7 +296,7 @@ class Table:
         if len(bool_list) != len(self._data):
             raise RowError("Длина bool_list должна совпадать с количеством строк")
         
-        filtered_data = [row for i, row in enumerate(self._data) if bool_list[i]]
+        filtered_data = list(compress(self._data, bool_list))
         
         if copy_table:
             import copy
@@ -289,7 +307,162 @@ class Table:
             new_table._column_types = new_types
             return new_table
         else:
-            return Table(filtered_data, self._headers, self._index_col)
+            return self._share_rows(filtered_data)
+    
+    # ХЕШ-ОПЕРАЦИИ ПО КЛЮЧАМ
+    def _row_keys(self, columns: Union[int, str, List[Union[int, str]], None]) -> List[Any]:
+        """
+        Ключи строк для хеш-операций
+        
+        Для одного столбца ключ - само значение, для списка столбцов (или None -
+        все столбцы) - кортеж значений. Строки без какого-либо из столбцов
+        получают ключ _MISSING.
+        """
+        if columns is None:
+            col_idxs = list(range(len(self._headers)))
+        elif isinstance(columns, (list, tuple)):
+            col_idxs = [self._get_column_index(column) for column in columns]
+        else:
+            col_idx = self._get_column_index(columns)
+            if all(col_idx < len(row) for row in self._data):
+                return list(map(operator.itemgetter(col_idx), self._data))
+            return [row[col_idx] if col_idx < len(row) else _MISSING for row in self._data]
+        
+        width = max(col_idxs, default=-1) + 1
+        if len(col_idxs) == 1:
+            getter = lambda row: (row[col_idxs[0]],)
+        elif col_idxs:
+            getter = operator.itemgetter(*col_idxs)
+        else:
+            getter = lambda row: ()
+        return [getter(row) if len(row) >= width else _MISSING for row in self._data]
+    
+    def duplicated(self, columns: Union[int, str, List[Union[int, str]], None] = None) -> List[bool]:
+        """
+        Маска повторов: True для строк, ключ которых уже встречался выше
+        
+        Args:
+            columns: столбец, список столбцов или None (вся строка)
+        
+        Returns:
+            List[bool]: маска для filter_rows
+        """
+        seen = set()
+        result = []
+        try:
+            for key in self._row_keys(columns):
+                if key is _MISSING or key not in seen:
+                    seen.add(key)
+                    result.append(False)
+                else:
+                    result.append(True)
+        except TypeError as e:
+            raise OperationError(f"Значение ключа нельзя хешировать: {e}")
+        return result
+    
+    def distinct(self, columns: Union[int, str, List[Union[int, str]], None] = None,
+                 copy_table: bool = False) -> 'Table':
+        """
+        Строки без повторов (остается первое вхождение каждого ключа)
+        
+        Args:
+            columns: столбец, список столбцов или None (вся строка)
+            copy_table: вернуть копию данных
+        
+        Returns:
+            Table: строки с уникальными ключами
+        """
+        duplicated = self.duplicated(columns)
+        return self.filter_rows([not is_dup for is_dup in duplicated], copy_table)
+    
+    def key_set(self, columns: Union[int, str, List[Union[int, str]], None] = None) -> set:
+        """
+        Множество ключей строк (для списка столбцов - кортежи)
+        
+        Строки, в которых нет какого-либо из столбцов, в множество не попадают.
+        
+        Args:
+            columns: столбец, список столбцов или None (вся строка)
+        
+        Returns:
+            set: ключи, пригодные для is_in
+        """
+        try:
+            keys = set(self._row_keys(columns))
+        except TypeError as e:
+            raise OperationError(f"Значение ключа нельзя хешировать: {e}")
+        keys.discard(_MISSING)
+        return keys
+    
+    def is_in(self, values: Iterable[Any],
+              column: Union[int, str, List[Union[int, str]]] = 0) -> List[bool]:
+        """
+        Маска вхождения значений столбца в values за один проход по хеш-таблице
+        
+        Args:
+            values: допустимые значения (для списка столбцов - кортежи)
+            column: столбец или список столбцов
+        
+        Returns:
+            List[bool]: маска для filter_rows
+        """
+        try:
+            lookup = values if isinstance(values, (set, frozenset, dict)) else set(values)
+            return [key in lookup for key in self._row_keys(column)]
+        except TypeError as e:
+            raise OperationError(f"Значение ключа нельзя хешировать: {e}")
+    
+    # ОТБОР СТРОК
+    def _select_rows(self, rows: List[List[Any]], copy_table: bool) -> 'Table':
+        if copy_table:
+            import copy
+            new_table = Table(copy.deepcopy(rows), copy.deepcopy(self._headers), self._index_col)
+            new_table._column_types = copy.deepcopy(self._column_types)
+            return new_table
+        return self._share_rows(rows)
+    
+    def head(self, n: int = 5, copy_table: bool = False) -> 'Table':
+        """Первые n строк"""
+        if n < 0:
+            raise RowError(f"Некорректное количество строк: {n}")
+        return self._select_rows(self._data[:n], copy_table)
+    
+    def tail(self, n: int = 5, copy_table: bool = False) -> 'Table':
+        """Последние n строк"""
+        if n < 0:
+            raise RowError(f"Некорректное количество строк: {n}")
+        return self._select_rows(self._data[max(len(self._data) - n, 0):] if n else [], copy_table)
+    
+    def top_k(self, column: Union[int, str], k: int, largest: bool = True,
+              copy_table: bool = False) -> 'Table':
+        """
+        k строк с наибольшими значениями в столбце без полной сортировки
+        
+        Args:
+            column: столбец
+            k: количество строк
+            largest: True - наибольшие значения, False - наименьшие
+            copy_table: вернуть копию данных
+        
+        Returns:
+            Table: строки, упорядоченные по значению столбца
+        """
+        col_idx = self._get_column_index(column)
+        return self._select_rows(top_k_rows(self._data, col_idx, k, largest), copy_table)
+    
+    def sample(self, n: int, seed: Optional[int] = None, copy_table: bool = False) -> 'Table':
+        """
+        Случайная выборка n строк (резервуарный метод), порядок строк сохраняется
+        
+        Args:
+            n: размер выборки; если строк меньше, возвращаются все
+            seed: зерно генератора случайных чисел
+            copy_table: вернуть копию данных
+        
+        Returns:
+            Table: выбранные строки
+        """
+        return self._select_rows(reservoir_sample(self._data, n, seed), copy_table)
     
         # ДОБАВЬ ЭТО ПРЯМО В КЛАСС - ПОСЛЕ set_value И ДО print_table
 
@@ -351,18 +524,70 @@ class Table:
         result_data = [[val] for val in result_values]
         return Table(result_data, ["result_div"])
 
-    def gr(self, other: Any, column: Union[int, str] = 0) -> List[bool]:
-        """Больше >"""
-        col_idx = self._get_column_index(column)
-        result = []
+    # СТАТИСТИКА СТОЛБЦОВ
+    def _build_stats(self) -> None:
+        """
+        Подсчет статистики всех столбцов
         
-        for row in self._data:
-            if col_idx >= len(row):
-                result.append(False)
-                continue
-            result.append(row[col_idx] > other)
+        Вызывается загрузчиками для только что прочитанных таблиц: их строки
+        еще не видны снаружи, поэтому измениться в обход таблицы не могут.
+        """
+        version = self._data_version[0]
+        self._stats = {col_idx: build_column_stats(self._data, col_idx, version)
+                       for col_idx in range(len(self._headers))}
+    
+    def _fresh_stats(self, col_idx: int) -> Optional[ColumnStats]:
+        stats = self._stats.get(col_idx)
+        if stats is None or stats.version != self._data_version[0] or stats.n_rows != len(self._data):
+            return None
+        return stats
+    
+    def _data_changed(self, col_idxs: Optional[List[int]] = None) -> None:
+        # Пересчитываем только статистику, которая была актуальна до изменения:
+        # иначе строки могли уйти наружу и статистике доверять нельзя
+        kept = self._stats
+        if not kept or any(self._fresh_stats(col_idx) is None for col_idx in kept):
+            kept = {}
+        self.invalidate_stats()
+        version = self._data_version[0]
+        for col_idx, stats in kept.items():
+            if col_idxs is None or col_idx in col_idxs:
+                stats = build_column_stats(self._data, col_idx, version)
+            else:
+                stats.version = version
+            self._stats[col_idx] = stats
+    
+    def invalidate_stats(self) -> None:
+        """
+        Сброс статистики столбцов
         
-        return result
+        Методы таблицы вызывают его сами. После изменения строк напрямую
+        через data его нужно вызвать явно. Сбрасывает статистику и у таблиц,
+        разделяющих строки с этой; после сброса сравнения просматривают все строки.
+        """
+        self._data_version[0] += 1
+        self._stats = {}
+    
+    def describe(self) -> 'Table':
+        """
+        Статистика по столбцам
+        
+        Для загруженной таблицы все значения берутся из статистики, посчитанной
+        при загрузке, без просмотра данных. Если статистики нет, она считается разово.
+        
+        Returns:
+            Table: таблица со столбцами column, count, nulls, min, max, distinct
+        """
+        result_data = []
+        for col_idx, header in enumerate(self._headers):
+            stats = self._fresh_stats(col_idx)
+            if stats is None:
+                # Разовый подсчет: в кеш не кладем, строки могли уйти наружу
+                stats = build_column_stats(self._data, col_idx, self._data_version[0])
+            col_min, col_max = stats.bounds()
+            result_data.append([header, stats.count, stats.null_count,
+                                col_min, col_max, stats.distinct])
+        return Table(result_data, ["column", "count", "nulls", "min", "max", "distinct"])
     
     def print_table(self) -> None:
         if not self._headers and not self._data:
@@ -392,6 +617,7 @@ class Table:
     
     @property
     def data(self) -> List[List[Any]]:
+        # После изменения строк напрямую нужно вызвать invalidate_stats()
         return self._data
     
     @property
@@ -402,4 +628,105 @@ class Table:
     def shape(self) -> tuple:
         rows = len(self._data)
         cols = len(self._headers) if self._headers else (len(self._data[0]) if self._data else 0)
-        return (rows, cols)
\ No newline at end of file
+        return (rows, cols)
+
+    # СЕРИАЛИЗАЦИЯ
+    def __reduce_ex__(self, protocol: int) -> tuple:
+        return (_restore_table, (self._get_state(protocol),))
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # Pickle-файлы старого формата хранят __dict__ без полей статистики
+        self.__dict__.update(state)
+        self._stats = {}
+        self._data_version = [0]
+
+    def __copy__(self) -> 'Table':
+        # Поверхностная копия без сериализации: строки общие, как у copy.copy по умолчанию
+        new_table = Table.__new__(Table)
+        new_table.__dict__.update(self.__dict__)
+        new_table._stats = {}
+        return new_table
+
+    def _get_state(self, protocol: int = pickle.HIGHEST_PROTOCOL) -> Dict[str, Any]:
+        """
+        Компактное состояние таблицы по столбцам
+
+        Типы хранятся один раз по номеру столбца. Однородные int/float
+        столбцы упаковываются в array самого узкого подходящего типа, а при
+        protocol >= 5 передаются как PickleBuffer (их можно отдать вне основного
+        потока через buffer_callback). Таблицы с неровными строками сохраняются
+        построчно.
+        """
+        n_cols = len(self._headers)
+        state: Dict[str, Any] = {
+            'headers': self._headers,
+            'index_col': self._index_col,
+            'types': {key: value for key, value in self._column_types.items()
+                      if isinstance(key, int)},
+        }
+        if not n_cols or not set(map(len, self._data)) <= {n_cols}:
+            state['rows'] = self._data
+            return state
+
+        state['columns'] = [_pack_column(list(map(operator.itemgetter(col_idx), self._data)), protocol)
+                            for col_idx in range(n_cols)]
+        state['byteorder'] = sys.byteorder
+        return state
+
+
+def _compare_rows(rows: List[List[Any]], col_idx: int, compare: Any, other: Any) -> List[bool]:
+    try:
+        return [compare(row[col_idx], other) if col_idx < len(row) else False for row in rows]
+    except (TypeError, ValueError) as e:
+        raise OperationError(f"Ошибка при сравнении: {e}")
+
+
+def _pack_column(values: List[Any], protocol: int) -> Any:
+    value_types = set(map(type, values))
+    if value_types == {float}:
+        typecode = 'd'
+    elif value_types == {int}:
+        low, high = min(values), max(values)
+        typecode = next((code for code, code_min, code_max in _INT_TYPECODES
+                         if code_min <= low and high <= code_max), None)
+        if typecode is None:
+            return values
+    else:
+        return values
+    packed = array(typecode, values)
+    if protocol >= 5:
+        return (typecode, pickle.PickleBuffer(packed))
+    return (typecode, packed.tobytes())
+
+
+def _unpack_column(column: Any, byteorder: str) -> List[Any]:
+    if isinstance(column, list):
+        return column
+    typecode, buffer = column
+    values = array(typecode)
+    values.frombytes(memoryview(buffer).cast('B'))
+    if byteorder != sys.byteorder:
+        values.byteswap()
+    return values.tolist()
+
+
+def _restore_table(state: Dict[str, Any]) -> Table:
+    """Восстановление таблицы из состояния Table._get_state без повторного определения типов"""
+    table = Table.__new__(Table)
+    table._headers = list(state['headers'])
+    table._index_col = state['index_col']
+    table._stats = {}
+    table._data_version = [0]
+    if 'rows' in state:
+        table._data = list(map(list, state['rows']))
+    else:
+        byteorder = state.get('byteorder', sys.byteorder)
+        columns = [_unpack_column(column, byteorder) for column in state['columns']]
+        table._data = list(map(list, zip(*columns)))
+
+    table._column_types = {}
+    for col_idx, col_type in state['types'].items():
+        table._column_types[col_idx] = col_type
+        if col_idx < len(table._headers):
+            table._column_types[table._headers[col_idx]] = col_type
+    return table
@@ -0,0 +1,160 @@
+# column_stats.py
+from typing import Any, List, Optional
+
+# Количество строк в одном блоке статистики
+CHUNK_SIZE = 1024
+
+# Типы, для которых min/max задают корректную границу сравнений
+_ORDERED_TYPES = (int, float, bool, str)
+
+
+class ChunkStats:
+    """Статистика блока строк [start, stop) одного столбца (zone map)"""
+
+    __slots__ = ('start', 'stop', 'min', 'max', 'null_count',
+                 'missing_count', 'ordered', 'distinct')
+
+    def __init__(self, start: int, stop: int):
+        self.start = start
+        self.stop = stop
+        self.min: Any = None
+        self.max: Any = None
+        self.null_count = 0
+        self.missing_count = 0
+        self.ordered = False
+        # Число различных значений блока (None, если их нельзя хешировать)
+        self.distinct: Optional[int] = None
+
+    def decide(self, operation: str, other: Any) -> Optional[bool]:
+        """
+        Результат сравнения сразу для всего блока
+
+        Returns:
+            Optional[bool]: False - ни одна строка не подходит, True - подходят все,
+                            None - блок нужно просмотреть построчно
+        """
+        if self.missing_count == self.stop - self.start:
+            return False
+        if not self.ordered or self.null_count or type(other) not in _ORDERED_TYPES:
+            return None
+        if other != other:
+            return None
+        lo, hi = self.min, self.max
+        complete = self.missing_count == 0
+        try:
+            if operation == 'eq':
+                if other < lo or other > hi:
+                    return False
+                if complete and lo == hi == other:
+                    return True
+            elif operation == 'ne':
+                if complete and (other < lo or other > hi):
+                    return True
+                if lo == hi == other:
+                    return False
+            elif operation == 'gr':
+                if hi <= other:
+                    return False
+                if complete and lo > other:
+                    return True
+            elif operation == 'ge':
+                if hi < other:
+                    return False
+                if complete and lo >= other:
+                    return True
+            elif operation == 'ls':
+                if lo >= other:
+                    return False
+                if complete and hi < other:
+                    return True
+            elif operation == 'le':
+                if lo > other:
+                    return False
+                if complete and hi <= other:
+                    return True
+        except TypeError:
+            return None
+        return None
+
+
+class ColumnStats:
+    """Статистика столбца: блоки ChunkStats и общие показатели"""
+
+    def __init__(self, chunks: List[ChunkStats], n_rows: int, version: int,
+                 distinct: Optional[int] = None):
+        self.chunks = chunks
+        self.n_rows = n_rows
+        self.version = version
+        # Число различных значений всего столбца, считается вместе с блоками
+        self.distinct = distinct
+
+    @property
+    def count(self) -> int:
+        return sum(chunk.stop - chunk.start - chunk.missing_count - chunk.null_count
+                   for chunk in self.chunks)
+
+    @property
+    def null_count(self) -> int:
+        return sum(chunk.null_count for chunk in self.chunks)
+
+    def bounds(self) -> tuple:
+        """Минимум и максимум столбца по статистике блоков (None, если не определены)"""
+        bounds = [(chunk.min, chunk.max) for chunk in self.chunks
+                  if chunk.ordered and chunk.stop - chunk.start > chunk.missing_count + chunk.null_count]
+        if not bounds or any(not chunk.ordered for chunk in self.chunks):
+            return (None, None)
+        try:
+            return (min(lo for lo, _ in bounds), max(hi for _, hi in bounds))
+        except TypeError:
+            return (None, None)
+
+
+def build_column_stats(data: List[List[Any]], col_idx: int, version: int,
+                       chunk_size: int = CHUNK_SIZE) -> ColumnStats:
+    """
+    Подсчет статистики столбца по блокам
+
+    Args:
+        data: строки таблицы
+        col_idx: номер столбца
+        version: версия данных, для которой считается статистика
+        chunk_size: размер блока
+
+    Returns:
+        ColumnStats: статистика столбца
+    """
+    chunks = []
+    seen: Optional[set] = set()
+    for start in range(0, len(data), chunk_size):
+        chunk = ChunkStats(start, min(start + chunk_size, len(data)))
+        values = []
+        for row in data[chunk.start:chunk.stop]:
+            if col_idx >= len(row):
+                chunk.missing_count += 1
+            elif row[col_idx] is None:
+                chunk.null_count += 1
+            else:
+                values.append(row[col_idx])
+
+        try:
+            distinct_values = set(values)
+        except TypeError:
+            distinct_values = None
+        if distinct_values is None:
+            seen = None
+        else:
+            chunk.distinct = len(distinct_values)
+            if seen is not None:
+                seen |= distinct_values
+
+        if all(type(value) in _ORDERED_TYPES and value == value for value in values):
+            try:
+                if values:
+                    chunk.min = min(values)
+                    chunk.max = max(values)
+                chunk.ordered = True
+            except TypeError:
+                pass
+        chunks.append(chunk)
+
+    return ColumnStats(chunks, len(data), version, len(seen) if seen is not None else None)
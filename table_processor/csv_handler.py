@@ -1,22 +1,25 @@
 # csv_handler.py
 import csv
-from typing import List, Any
+from itertools import islice
+from typing import List, Any, Dict, Iterator, Optional
 from .base_table import Table
 from .exceptions import FileOperationError
+from .io_utils import open_text, write_text
 
-def load_table(filename: str, **kwargs) -> Table:
+def load_table(filename: str, compression: Optional[str] = 'infer', **kwargs) -> Table:
     """
     Загрузка таблицы из CSV файла
     
     Args:
         filename: имя файла
+        compression: 'infer' (по расширению .gz/.bz2/.xz), 'gzip', 'bz2', 'lzma' или None
         **kwargs: дополнительные параметры для csv.reader
         
     Returns:
         Table: загруженная таблица
     """
     try:
-        with open(filename, 'r', newline='', encoding='utf-8') as file:
+        with open_text(filename, 'r', compression, newline='') as file:
             # Определяем есть ли заголовки
             has_header = kwargs.pop('has_header', True)
             delimiter = kwargs.get('delimiter', ',')
@@ -34,31 +37,79 @@ def load_table(filename: str, **kwargs) -> Table:
                 headers = [f"col_{i}" for i in range(len(rows[0]))]
                 data = rows
                 
-            return Table(data, headers)
+            table = Table(data, headers)
+            table._build_stats()
+            return table
             
     except Exception as e:
         raise FileOperationError(f"Ошибка загрузки CSV: {e}")
 
-def save_table(table: Table, filename: str, **kwargs) -> None:
+def save_table(table: Table, filename: str, compression: Optional[str] = 'infer',
+               atomic: bool = True, **kwargs) -> None:
     """
     Сохранение таблицы в CSV файл
     
     Args:
         table: таблица для сохранения
         filename: имя файла
+        compression: 'infer' (по расширению .gz/.bz2/.xz), 'gzip', 'bz2', 'lzma' или None
+        atomic: писать во временный файл и переименовывать только после успешной записи
         **kwargs: дополнительные параметры для csv.writer
     """
     try:
-        with open(filename, 'w', newline='', encoding='utf-8') as file:
+        with write_text(filename, compression, atomic, newline='') as file:
             writer = csv.writer(file, **kwargs)
             
             # Записываем заголовки
             if table.headers:
                 writer.writerow(table.headers)
             
-            # Записываем данные
-            for row in table.data:
-                writer.writerow(row)
+            # Записываем данные одним вызовом, без цикла по строкам в Python
+            writer.writerows(table.data)
                 
     except Exception as e:
-        raise FileOperationError(f"Ошибка сохранения CSV: {e}")
\ No newline at end of file
+        raise FileOperationError(f"Ошибка сохранения CSV: {e}")
+
+def iter_table(filename: str, chunk_size: int = 10000, compression: Optional[str] = 'infer',
+               column_types: Optional[Dict[str, type]] = None, **kwargs) -> Iterator[Table]:
+    """
+    Потоковое чтение CSV файла блоками по chunk_size строк
+    
+    Args:
+        filename: имя файла
+        chunk_size: количество строк в блоке
+        compression: 'infer' (по расширению .gz/.bz2/.xz), 'gzip', 'bz2', 'lzma' или None
+        column_types: типы столбцов по именам, применяются к каждому блоку
+        **kwargs: дополнительные параметры для csv.reader
+        
+    Yields:
+        Table: очередной блок таблицы
+    """
+    if chunk_size <= 0:
+        raise FileOperationError(f"Некорректный размер блока: {chunk_size}")
+    try:
+        with open_text(filename, 'r', compression, newline='') as file:
+            has_header = kwargs.pop('has_header', True)
+            reader = csv.reader(file, **kwargs)
+            
+            headers = None
+            if has_header:
+                headers = next(reader, None)
+                if headers is None:
+                    return
+            
+            while True:
+                data = list(islice(reader, chunk_size))
+                if not data:
+                    return
+                if headers is None:
+                    headers = [f"col_{i}" for i in range(len(data[0]))]
+                
+                chunk = Table(data, list(headers))
+                if column_types:
+                    chunk.set_column_types(column_types, by_number=False)
+                chunk._build_stats()
+                yield chunk
+                
+    except Exception as e:
+        raise FileOperationError(f"Ошибка загрузки CSV: {e}")
@@ -0,0 +1,151 @@
+# io_utils.py
+import bz2
+import gzip
+import io
+import lzma
+import os
+import secrets
+import tempfile
+from contextlib import contextmanager
+from typing import IO, Iterator, Optional
+from .exceptions import FileOperationError
+
+# Размер буфера записи: меньше системных вызовов на больших выгрузках
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Переданный файловый объект эти функции не закрывают - это делает вызывающий код
+_OPENERS = {
+    'gzip': gzip.open,
+    'bz2': bz2.open,
+    'lzma': lzma.open,
+}
+
+_EXTENSIONS = {
+    '.gz': 'gzip',
+    '.bz2': 'bz2',
+    '.xz': 'lzma',
+    '.lzma': 'lzma',
+}
+
+
+def detect_compression(filename: str, compression: Optional[str] = 'infer') -> Optional[str]:
+    """
+    Определение типа сжатия файла
+
+    Args:
+        filename: имя файла
+        compression: 'infer' (по расширению), 'gzip', 'bz2', 'lzma' или None
+
+    Returns:
+        Optional[str]: тип сжатия или None для обычного файла
+    """
+    if compression == 'infer':
+        _, ext = os.path.splitext(filename)
+        return _EXTENSIONS.get(ext.lower())
+    if compression is not None and compression not in _OPENERS:
+        raise FileOperationError(f"Неподдерживаемый тип сжатия: {compression}")
+    return compression
+
+
+def _wrap_text(raw: IO[bytes], mode: str, compression: Optional[str],
+               encoding: str, newline: Optional[str]) -> IO[str]:
+    if compression is not None:
+        raw = _OPENERS[compression](raw, mode + 'b')
+    return io.TextIOWrapper(raw, encoding=encoding, newline=newline)
+
+
+def open_text(filename: str, mode: str = 'r', compression: Optional[str] = 'infer',
+              encoding: str = 'utf-8', newline: Optional[str] = None) -> IO[str]:
+    """
+    Открытие текстового файла с учетом сжатия
+
+    Args:
+        filename: имя файла
+        mode: 'r' или 'w'
+        compression: тип сжатия (см. detect_compression)
+        encoding: кодировка
+        newline: параметр newline для текстового потока
+
+    Returns:
+        IO[str]: текстовый поток
+    """
+    compression = detect_compression(filename, compression)
+    if compression is not None:
+        # Открываем по имени файла: тогда поток сжатия сам закроет файл
+        return _OPENERS[compression](filename, mode + 't', encoding=encoding, newline=newline)
+    return open(filename, mode, buffering=WRITE_BUFFER_SIZE, encoding=encoding, newline=newline)
+
+
+@contextmanager
+def write_text(filename: str, compression: Optional[str] = 'infer', atomic: bool = True,
+               encoding: str = 'utf-8', newline: Optional[str] = None) -> Iterator[IO[str]]:
+    """
+    Запись текстового файла с учетом сжатия
+
+    При atomic=True данные пишутся во временный файл в той же директории,
+    который после успешной записи переименовывается в filename. При ошибке
+    исходный файл остается нетронутым. Если filename - символическая ссылка,
+    заменяется файл, на который она указывает, а сама ссылка сохраняется.
+
+    Args:
+        filename: имя файла
+        compression: тип сжатия (см. detect_compression)
+        atomic: писать через временный файл и переименование
+        encoding: кодировка
+        newline: параметр newline для текстового потока
+
+    Yields:
+        IO[str]: текстовый поток для записи
+    """
+    compression = detect_compression(filename, compression)
+    if not atomic:
+        with open_text(filename, 'w', compression, encoding, newline) as file:
+            yield file
+        return
+
+    target = os.path.realpath(filename)
+    fd, tmp_name = _create_temp(target)
+    try:
+        with os.fdopen(fd, 'wb', buffering=WRITE_BUFFER_SIZE) as raw:
+            file = _wrap_text(raw, 'w', compression, encoding, newline)
+            try:
+                yield file
+            finally:
+                # detach сбрасывает буфер, не закрывая raw; поток сжатия
+                # закрываем отдельно, чтобы дописать его хвост
+                stream = file.detach()
+                if compression is not None:
+                    stream.close()
+            raw.flush()
+            os.fsync(raw.fileno())
+        _copy_mode(target, tmp_name)
+        os.replace(tmp_name, target)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def _create_temp(target: str) -> tuple:
+    # Права 0o666 с учетом umask процесса выставляет само ядро, как для open(..., 'w');
+    # mkstemp создал бы файл с правами 0o600
+    directory, name = os.path.split(target)
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+    for _ in range(tempfile.TMP_MAX):
+        tmp_name = os.path.join(directory, f'.{name}.{secrets.token_hex(6)}.tmp')
+        try:
+            return os.open(tmp_name, flags, 0o666), tmp_name
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"Не удалось создать временный файл для {target}")
+
+
+def _copy_mode(target: str, tmp_name: str) -> None:
+    # Перезаписываемый файл сохраняет свои права
+    try:
+        mode = os.stat(target).st_mode & 0o7777
+    except FileNotFoundError:
+        return
+    os.chmod(tmp_name, mode)
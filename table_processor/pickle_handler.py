@@ -1,7 +1,7 @@
 # pickle_handler.py
 import pickle
 from .base_table import Table
-from .exceptions import FileOperationError
+from .exceptions import ColumnError, FileOperationError
 
 def load_table(filename: str, **kwargs) -> Table:
     """
@@ -19,9 +19,23 @@ def load_table(filename: str, **kwargs) -> Table:
             data = pickle.load(file, **kwargs)
             
             if isinstance(data, Table):
+                data._build_stats()
                 return data
             elif isinstance(data, dict) and 'data' in data and 'headers' in data:
-                return Table(data['data'], data['headers'])
+                table = Table(data['data'], data['headers'], data.get('index_col'))
+                # Явно заданные типы применяем поверх определенных по данным
+                types = {}
+                for col, col_type in data.get('column_types', {}).items():
+                    if isinstance(col, int):
+                        types[col] = col_type
+                    elif col in table.headers:
+                        types[table.headers.index(col)] = col_type
+                    else:
+                        raise ColumnError(f"Столбец '{col}' не найден")
+                if types:
+                    table.set_column_types(types, by_number=True)
+                table._build_stats()
+                return table
             else:
                 raise FileOperationError("Неподдерживаемый формат данных в pickle файле")
                 
@@ -39,7 +53,7 @@ def save_table(table: Table, filename: str, **kwargs) -> None:
     """
     try:
         with open(filename, 'wb') as file:
-            # Сохраняем как объект Table
+            # Сохраняем как объект Table (компактное состояние по столбцам)
             pickle.dump(table, file, **kwargs)
             
     except Exception as e:
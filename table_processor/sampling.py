@@ -0,0 +1,79 @@
+# sampling.py
+import heapq
+import math
+import random
+from itertools import islice
+from typing import Any, Iterable, List, Optional
+from .exceptions import OperationError
+
+
+def top_k_rows(rows: Iterable[List[Any]], col_idx: int, k: int,
+               largest: bool = True) -> List[List[Any]]:
+    """
+    k строк с наибольшими (наименьшими) значениями в столбце
+
+    Использует ограниченную кучу: O(n log k) времени и O(k) памяти,
+    поэтому rows может быть потоком. Строки без значения (короткие или None)
+    пропускаются, при равенстве значений раньше идет более ранняя строка.
+
+    Args:
+        rows: строки таблицы (любой итерируемый объект)
+        col_idx: номер столбца
+        k: количество строк
+        largest: True - наибольшие значения, False - наименьшие
+
+    Returns:
+        List[List[Any]]: отобранные строки в порядке убывания (возрастания)
+    """
+    if k < 0:
+        raise OperationError(f"Некорректное значение k: {k}")
+    candidates = (row for row in rows if col_idx < len(row) and row[col_idx] is not None)
+    select = heapq.nlargest if largest else heapq.nsmallest
+    try:
+        return select(k, candidates, key=lambda row: row[col_idx])
+    except TypeError as e:
+        raise OperationError(f"Ошибка при сравнении: {e}")
+
+
+def _uniform(rng: random.Random) -> float:
+    # Число из (0, 1): нужно для логарифмов в алгоритме L
+    value = rng.random()
+    while value == 0.0:
+        value = rng.random()
+    return value
+
+
+def reservoir_sample(rows: Iterable[List[Any]], n: int,
+                     seed: Optional[int] = None) -> List[List[Any]]:
+    """
+    Равномерная выборка n строк резервуарным методом (алгоритм L)
+
+    Проходит rows один раз с O(n) памяти, поэтому rows может быть потоком.
+    Случайные числа тратятся только на замены, а не на каждую строку.
+
+    Args:
+        rows: строки таблицы (любой итерируемый объект)
+        n: размер выборки
+        seed: зерно генератора случайных чисел
+
+    Returns:
+        List[List[Any]]: выбранные строки в исходном порядке
+    """
+    if n < 0:
+        raise OperationError(f"Некорректный размер выборки: {n}")
+    rng = random.Random(seed)
+    numbered = enumerate(rows)
+    reservoir = list(islice(numbered, n))
+
+    if len(reservoir) == n and n > 0:
+        weight = math.exp(math.log(_uniform(rng)) / n)
+        while True:
+            skip = math.floor(math.log(_uniform(rng)) / math.log1p(-weight))
+            item = next(islice(numbered, skip, skip + 1), None)
+            if item is None:
+                break
+            reservoir[rng.randrange(n)] = item
+            weight *= math.exp(math.log(_uniform(rng)) / n)
+
+    reservoir.sort(key=lambda item: item[0])
+    return [row for _, row in reservoir]
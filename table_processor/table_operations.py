@@ -1,7 +1,9 @@
 # table_operations.py
-from typing import List
+from itertools import chain
+from typing import Iterable, List, Optional, Tuple, Union
 from .base_table import Table
 from .exceptions import MergeError
+from .sampling import reservoir_sample, top_k_rows
 
 def merge_tables(table1: Table, table2: Table, by_number: bool = True, 
                 how: str = 'inner') -> Table:
@@ -112,4 +114,102 @@ def merge_tables(table1: Table, table2: Table, by_number: bool = True,
             result_row = [row_dict.get(header, '') for header in all_headers]
             result_data.append(result_row)
     
-    return Table(result_data, all_headers)
\ No newline at end of file
+    return Table(result_data, all_headers)
+
+
+def _join_mask(table1: Table, table2: Table, on: Union[int, str, List, None]) -> List[bool]:
+    if on is None:
+        if not table1._index_col or not table2._index_col:
+            raise MergeError("Для соединения по индексу обе таблицы должны иметь индексный столбец")
+        on1, on2 = table1._index_col, table2._index_col
+    else:
+        on1 = on2 = on
+    
+    return table1.is_in(table2.key_set(on2), on1)
+
+
+def semi_join(table1: Table, table2: Table, on: Union[int, str, List, None] = None,
+              copy_table: bool = False) -> Table:
+    """
+    Строки первой таблицы, ключ которых есть во второй (без дублирования строк)
+    
+    Args:
+        table1: первая таблица
+        table2: вторая таблица
+        on: столбец или список столбцов ключа; None - индексные столбцы таблиц
+        copy_table: вернуть копию данных
+    
+    Returns:
+        Table: отобранные строки первой таблицы
+    """
+    return table1.filter_rows(_join_mask(table1, table2, on), copy_table)
+
+
+def anti_join(table1: Table, table2: Table, on: Union[int, str, List, None] = None,
+              copy_table: bool = False) -> Table:
+    """
+    Строки первой таблицы, ключа которых нет во второй
+    
+    Args:
+        table1: первая таблица
+        table2: вторая таблица
+        on: столбец или список столбцов ключа; None - индексные столбцы таблиц
+        copy_table: вернуть копию данных
+    
+    Returns:
+        Table: отобранные строки первой таблицы
+    """
+    mask = _join_mask(table1, table2, on)
+    return table1.filter_rows([not matched for matched in mask], copy_table)
+
+
+def _stream_rows(tables: Iterable[Table]) -> Tuple[Optional[Table], Iterable[List]]:
+    iterator = iter(tables)
+    first = next(iterator, None)
+    if first is None:
+        return None, iter(())
+    return first, chain(first.data, chain.from_iterable(table.data for table in iterator))
+
+
+def top_k_stream(tables: Iterable[Table], column: Union[int, str], k: int,
+                 largest: bool = True) -> Table:
+    """
+    k строк с наибольшими значениями по потоку блоков (например, iter_csv)
+    
+    Держит в памяти только текущий блок и k лучших строк.
+    
+    Args:
+        tables: блоки с одинаковыми заголовками
+        column: столбец
+        k: количество строк
+        largest: True - наибольшие значения, False - наименьшие
+    
+    Returns:
+        Table: отобранные строки
+    """
+    first, rows = _stream_rows(tables)
+    col_idx = first._get_column_index(column) if first is not None else 0
+    selected = top_k_rows(rows, col_idx, k, largest)
+    if first is None:
+        return Table()
+    # Строки копируем: блоки-источники могут хранить статистику по ним
+    return Table([list(row) for row in selected], list(first.headers), first._index_col)
+
+
+def sample_stream(tables: Iterable[Table], n: int, seed: Optional[int] = None) -> Table:
+    """
+    Случайная выборка n строк по потоку блоков (например, iter_csv)
+    
+    Args:
+        tables: блоки с одинаковыми заголовками
+        n: размер выборки
+        seed: зерно генератора случайных чисел
+    
+    Returns:
+        Table: выбранные строки в исходном порядке
+    """
+    first, rows = _stream_rows(tables)
+    sampled = reservoir_sample(rows, n, seed)
+    if first is None:
+        return Table()
+    return Table([list(row) for row in sampled], list(first.headers), first._index_col)
@@ -1,18 +1,23 @@
 # text_handler.py
+from typing import Optional
 from .base_table import Table
 from .exceptions import FileOperationError
+from .io_utils import write_text
 
-def save_table(table: Table, filename: str, **kwargs) -> None:
+def save_table(table: Table, filename: str, compression: Optional[str] = 'infer',
+               atomic: bool = True, **kwargs) -> None:
     """
     Сохранение таблицы в текстовый файл
     
     Args:
         table: таблица для сохранения
         filename: имя файла
+        compression: 'infer' (по расширению .gz/.bz2/.xz), 'gzip', 'bz2', 'lzma' или None
+        atomic: писать во временный файл и переименовывать только после успешной записи
         **kwargs: дополнительные параметры
     """
     try:
-        with open(filename, 'w', encoding='utf-8') as file:
+        with write_text(filename, compression, atomic) as file:
             # Сохраняем таблицу в том же формате, что и print_table()
             if not table.headers and not table.data:
                 file.write("Пустая таблица\n")
@@ -34,13 +39,15 @@ def save_table(table: Table, filename: str, **kwargs) -> None:
             file.write(header_line + "\n")
             file.write("-" * len(header_line) + "\n")
             
-            # Записываем данные
+            # Записываем данные, собирая строки пачкой
+            lines = []
             for row in table.data:
                 row_line = ""
                 for i, cell in enumerate(row):
                     if i < len(col_widths):
                         row_line += f"{str(cell):<{col_widths[i]}}"
-                file.write(row_line + "\n")
+                lines.append(row_line + "\n")
+            file.writelines(lines)
                 
     except Exception as e:
         raise FileOperationError(f"Ошибка сохранения текстового файла: {e}")
\ No newline at end of file
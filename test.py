@@ -1,5 +1,22 @@
 # test.py
-from table_processor import Table, load_csv, save_csv, save_text
+import atexit
+import copy
+import os
+import pickle
+import shutil
+import tempfile
+from table_processor import Table, load_csv, save_csv, save_text, load_pickle, save_pickle
+from table_processor import iter_csv, sample_stream, top_k_stream, semi_join, anti_join
+from table_processor.exceptions import FileOperationError, OperationError
+
+# Служебные файлы проверок пишем во временную папку и удаляем при выходе
+TMP_DIR = tempfile.mkdtemp(prefix="table_processor_test_")
+atexit.register(shutil.rmtree, TMP_DIR, True)
+
+
+def tmp_path(name):
+    return os.path.join(TMP_DIR, name)
+
 
 print("=== ТЕСТ ЗАПУЩЕН ===")
 
@@ -52,4 +69,214 @@ older_employees = loaded_table.filter_rows(age_filter)
 print("Сотрудники старше 28 лет:")
 older_employees.print_table()
 
+print("Статистика по столбцам:")
+loaded_table.describe().print_table()
+
+print("Двое самых богатых:")
+loaded_table.top_k("зарплата", 2).print_table()
+
+print("Сотрудники 1 и 3 по индексу:")
+assert loaded_table.distinct("id").shape == loaded_table.shape
+Table(loaded_table.data, loaded_table.headers, index_col="id").get_rows_by_index(1, 3).print_table()
+
+# 6. СЖАТЫЙ CSV
+print("\n6. Сжатый CSV...")
+save_csv(loaded_table, tmp_path("сотрудники.csv"))
+plain_rows = load_csv(tmp_path("сотрудники.csv")).data
+for ext in ("gz", "bz2", "xz"):
+    save_csv(loaded_table, tmp_path(f"сотрудники.csv.{ext}"))
+    assert load_csv(tmp_path(f"сотрудники.csv.{ext}")).data == plain_rows
+    save_csv(loaded_table, tmp_path(f"сотрудники.csv.{ext}"), atomic=False)
+    assert load_csv(tmp_path(f"сотрудники.csv.{ext}")).data == plain_rows
+print("✓ gzip/bz2/xz туда-обратно работают!")
+
+# Ошибка посреди записи не должна портить старый файл
+class Broken:
+    def __str__(self):
+        raise ValueError("сломалось")
+
+try:
+    save_csv(Table([[1], [Broken()]], ["id"]), tmp_path("сотрудники.csv"))
+    assert False, "ожидалась ошибка сохранения"
+except FileOperationError:
+    pass
+assert load_csv(tmp_path("сотрудники.csv")).data == plain_rows
+assert not [name for name in os.listdir(TMP_DIR) if name.endswith(".tmp")]
+print("✓ Неудачная запись не тронула старый файл!")
+
+# Атомарная запись через символическую ссылку заменяет файл, а не ссылку
+if hasattr(os, "symlink"):
+    os.symlink("сотрудники.csv", tmp_path("ссылка.csv"))
+    save_csv(Table([[9]], ["id"]), tmp_path("ссылка.csv"))
+    assert os.path.islink(tmp_path("ссылка.csv"))
+    assert load_csv(tmp_path("сотрудники.csv")).data == [["9"]]
+    save_csv(loaded_table, tmp_path("сотрудники.csv"))
+    print("✓ Символическая ссылка сохранилась!")
+
+# 7. PICKLE
+print("\n7. Pickle...")
+save_pickle(loaded_table, tmp_path("сотрудники.pkl"))
+pickled_table = load_pickle(tmp_path("сотрудники.pkl"))
+assert pickled_table.data == loaded_table.data
+assert pickled_table.get_column_types() == loaded_table.get_column_types()
+print("✓ Данные и типы сохранились!")
+
+# Числовые столбцы разной ширины и пустая таблица переживают pickle
+for values in ([[-200], [5]], [[2 ** 40], [0]], [[2 ** 70], [1]], [[True], [1]], [[1], [1.5]]):
+    for protocol in (2, 4, 5):
+        restored = pickle.loads(pickle.dumps(Table(values, ["v"]), protocol=protocol))
+        assert restored.data == values
+        assert [type(row[0]) for row in restored.data] == [type(row[0]) for row in values]
+assert pickle.loads(pickle.dumps(Table([], ["v"]))).headers == ["v"]
+
+# copy.copy остается поверхностной копией
+assert copy.copy(loaded_table).data is loaded_table.data
+
+# Словарь с частично заданными типами: остальные столбцы определяются по данным
+with open(tmp_path("сотрудники.pkl"), "wb") as file:
+    pickle.dump({'data': [[1, 10], [2, 20]], 'headers': ['id', 'x'],
+                 'column_types': {'x': str}}, file)
+dict_table = load_pickle(tmp_path("сотрудники.pkl"))
+assert dict_table.get_values('id') == [1, 2]
+assert dict_table.get_values('x') == ['10', '20']
+assert dict_table.get_column_types(by_number=False) == {'id': int, 'x': str}
+
+with open(tmp_path("сотрудники.pkl"), "wb") as file:
+    pickle.dump({'data': [[1]], 'headers': ['id'], 'column_types': {'zz': int}}, file)
+try:
+    load_pickle(tmp_path("сотрудники.pkl"))
+    assert False, "ожидалась FileOperationError"
+except FileOperationError as e:
+    assert "'zz' не найден" in str(e)
+print("✓ Словарь с типами загружается правильно!")
+
+# 8. СТАТИСТИКА СТОЛБЦОВ
+print("\n8. Статистика столбцов...")
+# Изменение ячейки напрямую через data
+small = Table([[i] for i in range(10)], ["v"])
+assert not any(small.gr(100, "v"))
+small.data[0][0] = 1000
+assert small.gr(100, "v")[0]
+
+# Вторая таблица над теми же строками меняет данные
+shared_rows = [[i] for i in range(10)]
+first = Table(shared_rows, ["v"])
+assert not any(first.gr(100, "v"))
+Table(shared_rows, ["v"]).set_values([1000] * 10, "v")
+assert all(first.gr(100, "v"))
+
+# То же для загруженной таблицы, у которой статистика есть
+big = Table([[i] for i in range(3000)] + [[]] * 100 + [[7] for _ in range(1100)], ["v"])
+save_csv(big, tmp_path("статистика.csv"))
+stats_table = load_csv(tmp_path("статистика.csv"))
+stats_table.set_column_types({"v": int}, by_number=False)
+assert sum(stats_table.gr(2500, "v")) == 499
+child = stats_table.filter_rows([True] * stats_table.shape[0])
+child.set_values([5000] * child.shape[0], "v")
+assert sum(stats_table.gr(2500, "v")) == 4100
+stats_table = load_csv(tmp_path("статистика.csv"))
+stats_table.set_column_types({"v": int}, by_number=False)
+stats_table.data[0][0] = 9999
+stats_table.invalidate_stats()
+assert stats_table.gr(2500, "v")[0]
+
+# describe загруженной таблицы берет все из статистики
+stats_table = load_csv(tmp_path("статистика.csv"))
+stats_table.set_column_types({"v": int}, by_number=False)
+assert stats_table.describe().data == [["v", 4100, 0, 0, 2999, 3000]]
+
+# Результат потоковой выборки не разделяет строки с блоками iter_csv
+chunks = list(iter_csv(tmp_path("статистика.csv"), chunk_size=2048, column_types={"v": int}))
+before = chunks[0].gr(1000, "v")
+streamed = sample_stream(iter(chunks), 2048, seed=1)
+streamed.set_values([999999] * streamed.shape[0], "v")
+top_rows = top_k_stream(iter(chunks), "v", 10)
+top_rows.set_values([-1] * top_rows.shape[0], "v")
+assert chunks[0].gr(1000, "v") == before
+assert chunks[0].gr(1000, "v") == [row[0] > 1000 if row else False for row in chunks[0].data]
+
+# Pickle, записанный кодом до колоночного формата (состояние - __dict__)
+old_pickle = (
+    b'\x80\x04\x95\xf1\x00\x00\x00\x00\x00\x00\x00\x8c\x1atable_processor.base_table'
+    b'\x94\x8c\x05Table\x94\x93\x94)\x81\x94}\x94(\x8c\x05_data\x94]\x94(]\x94(K\x01'
+    b'\x8c\x08\xd0\x90\xd0\xbd\xd0\xbd\xd0\xb0\x94G@\x04\x00\x00\x00\x00\x00\x00e]\x94('
+    b'K\x02\x8c\n\xd0\x91\xd0\xbe\xd1\x80\xd0\xb8\xd1\x81\x94G@\x0c\x00\x00\x00\x00\x00'
+    b'\x00ee\x8c\x08_headers\x94]\x94(\x8c\x02id\x94\x8c\x06\xd0\xb8\xd0\xbc\xd1\x8f\x94'
+    b'\x8c\x01x\x94e\x8c\n_index_col\x94h\r\x8c\r_column_types\x94}\x94(K\x00\x8c\x08'
+    b'builtins\x94\x8c\x03int\x94\x93\x94h\rh\x15K\x01h\x13\x8c\x03str\x94\x93\x94h\x0eh'
+    b'\x17K\x02h\x13\x8c\x05float\x94\x93\x94h\x0fh\x19uub.'
+)
+with open(tmp_path("статистика.pkl"), "wb") as file:
+    file.write(old_pickle)
+old_table = load_pickle(tmp_path("статистика.pkl"))
+assert old_table.data == [[1, "Анна", 2.5], [2, "Борис", 3.5]]
+assert old_table.get_column_types(by_number=False) == {"id": int, "имя": str, "x": float}
+assert old_table.gr(1, "id") == [False, True]
+
+# eq/ne по блокам с пустыми ячейками
+stats_table = load_csv(tmp_path("статистика.csv"))
+stats_table.set_column_types({"v": int}, by_number=False)
+values = [row[0] if row else None for row in big.data]
+expected_eq = [value == 7 for value in values]
+expected_ne = [value is not None and value != 7 for value in values]
+assert stats_table.eq(7, "v") == expected_eq
+assert stats_table.ne(7, "v") == expected_ne
+assert stats_table.ne(-1, "v") == [value is not None for value in values]
+assert not any(stats_table.eq(-1, "v"))
+print("✓ Статистика не устаревает!")
+
+# 9. ОТБОР СТРОК
+print("\n9. head/tail, top-k и выборки...")
+three = Table([[1], [2], [3]], ["v"])
+assert three.head(2).data == [[1], [2]]
+assert three.head(5).data == [[1], [2], [3]]
+assert three.head(0).data == []
+assert three.tail(2).data == [[2], [3]]
+assert three.tail(5).data == [[1], [2], [3]]
+assert three.tail(0).data == []
+
+numbers = Table([[i, (i * 37) % 1000] for i in range(1000)], ["id", "x"])
+save_csv(numbers, tmp_path("выборка.csv.gz"))
+assert [row[1] for row in numbers.top_k("x", 3).data] == [999, 998, 997]
+streamed_top = top_k_stream(iter_csv(tmp_path("выборка.csv.gz"), chunk_size=64,
+                                     column_types={"id": int, "x": int}), "x", 3)
+assert streamed_top.data == numbers.top_k("x", 3).data
+
+sample_a = numbers.sample(10, seed=42)
+assert sample_a.data == numbers.sample(10, seed=42).data
+assert len(sample_a.data) == 10
+assert [row[0] for row in sample_a.data] == sorted(row[0] for row in sample_a.data)
+streamed_sample = sample_stream(iter_csv(tmp_path("выборка.csv.gz"), chunk_size=64,
+                                         column_types={"id": int, "x": int}), 10, seed=42)
+assert streamed_sample.data == sample_a.data
+assert three.sample(10, seed=1).data == three.data
+print("✓ Границы и детерминированность в порядке!")
+
+# 10. ДУБЛИ И ПОЛУСОЕДИНЕНИЯ
+print("\n10. Дубли и полусоединения...")
+pairs = Table([[1, "a", 0], [1, "b", 1], [1, "a", 2], [2, "a", 3], [1], [1]], ["k", "s", "n"])
+assert pairs.duplicated(["k", "s"]) == [False, False, True, False, False, False]
+assert pairs.duplicated("k") == [False, True, True, False, True, True]
+assert pairs.distinct(["k", "s"]).data == [[1, "a", 0], [1, "b", 1], [2, "a", 3], [1], [1]]
+assert pairs.is_in({(1, "a")}, ["k", "s"]) == [True, False, True, False, False, False]
+
+people = Table([[1, "Анна"], [2, "Борис"], [3, "Виктор"], [2, "Борис-2"]], ["id", "имя"], index_col="id")
+orders = Table([[2, 100], [2, 200], [3, 50], [9, 1]], ["id", "сумма"], index_col="id")
+assert semi_join(people, orders).data == [[2, "Борис"], [3, "Виктор"], [2, "Борис-2"]]
+assert anti_join(people, orders).data == [[1, "Анна"]]
+assert semi_join(orders, people, on="id").data == [[2, 100], [2, 200], [3, 50]]
+assert anti_join(orders, people, on=["id"]).data == [[9, 1]]
+try:
+    semi_join(people, Table([[[2]]], ["id"]), on="id")
+    assert False, "ожидалась OperationError"
+except OperationError:
+    pass
+assert pairs.key_set(["k", "s"]) == {(1, "a"), (1, "b"), (2, "a")}
+
+# Нехешируемые значения индекса ищутся линейным просмотром
+listed = Table([[[1, 2], "x"], [[3], "y"]], ["ключ", "v"], index_col="ключ")
+assert listed.get_rows_by_index([3]).data == [[[3], "y"]]
+assert people.get_rows_by_index([2], 3).data == [[3, "Виктор"]]
+print("✓ Хеш-операции работают!")
+
 print("\n=== ТЕСТ УСПЕШНО ЗАВЕРШЕН ===")
\ No newline at end of file